@@ -11,14 +11,52 @@ Notes:
   consider obeying Walmart's robots.txt and using rate limiting, proxies, or an official API.
 """
 
-from bs4 import BeautifulSoup
-import requests
+import httpx
+import lxml.html
+import asyncio
+import functools
+import io
 import json
-import time
-import random
 import re
+import sqlite3
+import time
+from contextlib import asynccontextmanager
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
 from urllib.parse import quote_plus, urlsplit, urlunsplit
 
+try:
+    from selectolax.parser import HTMLParser
+except ImportError:  # selectolax is optional; lxml is used instead
+    HTMLParser = None
+
+try:
+    import hyperscan
+except ImportError:  # hyperscan is optional (x86-64 only); a compiled regex is used instead
+    hyperscan = None
+
+try:
+    import orjson
+except ImportError:  # orjson is optional; the stdlib json module is used instead
+    orjson = None
+
+try:
+    import ijson
+except ImportError:  # ijson is optional; __NEXT_DATA__ is decoded in full instead
+    ijson = None
+
+# orjson.JSONDecodeError subclasses json.JSONDecodeError, so callers can catch either the same way
+_json_loads = orjson.loads if orjson is not None else json.loads
+# stdlib decoder for parsing a JSON value embedded at an offset inside a larger string
+_RAW_DECODER = json.JSONDecoder()
+# ijson's pure-Python backend is slower than a full decode, so lazy parsing is only used with yajl2_c
+_IJSON_FAST = ijson is not None and ijson.backend == "yajl2_c"
+NEXT_DATA_PREFIX = "props.pageProps.initialData.data"
+# parse events the lazy __NEXT_DATA__ scan may spend outside the subtrees it builds before giving up
+# (~1ms with yajl2_c); walking a whole multi-MB blob event by event is several times slower than orjson
+LAZY_EVENT_BUDGET = 2000
+
+# Accept-Encoding is left to httpx: it offers gzip/deflate, plus br only when brotli is installed to decode it
 HEADERS = {
     'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
                   '(KHTML, like Gecko) Chrome/139.0.0.0 Safari/537.36 Edg/139.0.0.0',
@@ -31,15 +69,231 @@ BOT_CHECK_KEYWORDS = [
     "are you a human", "captcha", "bot", "please verify", "verify you are a human",
     "recaptcha", "Access Denied", "unusual traffic"
 ]
+# all keywords folded into one alternation so a page is scanned once rather than once per keyword
+_BOT_RE = re.compile("|".join(re.escape(kw.lower()) for kw in BOT_CHECK_KEYWORDS))
+# with hyperscan installed, the same keyword set is compiled into a single SIMD-accelerated DFA
+_BOT_DB = None
+if hyperscan is not None:
+    _BOT_DB = hyperscan.Database()
+    _BOT_DB.compile(
+        expressions=[re.escape(kw).encode() for kw in BOT_CHECK_KEYWORDS],
+        flags=[hyperscan.HS_FLAG_CASELESS | hyperscan.HS_FLAG_SINGLEMATCH] * len(BOT_CHECK_KEYWORDS),
+    )
+
+# '/ip/...' product paths, optionally preceded by a scheme/host, as they appear anywhere in raw HTML
+_IP_RE = re.compile(r'(?:(?:https?:)?//[^/]+)?(/ip/[^"\'\\\s<>]+)')
+# search pages are scanned as they stream in; the tail of each chunk is re-scanned with the next one
+# so a product path split across a chunk boundary is still matched whole
+STREAM_CHUNK_SIZE = 64 * 1024  # characters
+STREAM_OVERLAP = 1024  # characters, comfortably longer than any product path
+
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_STATUSES = {429, 503}  # the host is asking every worker to back off, not just this request
+MAX_RETRIES = 3
+MAX_CONCURRENT_PRODUCTS = 6
+
+# adaptive politeness (see ThrottlingTransport): requests to one host start at least MIN_REQUEST_INTERVAL
+# apart across all workers, and once the host's moving-average response time exceeds
+# SLOW_RESPONSE_THRESHOLD that average is added to the gap
+MIN_REQUEST_INTERVAL = 0.5  # seconds
+SLOW_RESPONSE_THRESHOLD = 2.0  # seconds
+RESPONSE_TIME_SMOOTHING = 0.3  # weight of the newest sample in the moving average
+
+CACHE_PATH = "walmart_cache.sqlite"
+CACHE_EXPIRE_AFTER = 3600  # seconds
+
+
+class ThrottlingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper that paces requests per host, across all concurrent workers: each request reserves
+    a start slot MIN_REQUEST_INTERVAL (plus the slow-server back-off) after the previous one to that host,
+    and a rate-limit response holds back every request to that host for its Retry-After / backoff delay.
+    It sits below CachingTransport, so pages served from the cache are never delayed.
+    """
+
+    def __init__(self, transport: httpx.AsyncBaseTransport):
+        self._transport = transport
+        self._next_start = {}  # host -> event-loop time at which the next request may start
+        self._response_times = {}  # host -> moving average of time until response headers, in seconds
+        self._rate_limited = {}  # host -> consecutive rate-limit responses, drives the backoff
+        self._resume_at = {}  # host -> event-loop time before which no request may start after a rate limit
+
+    def _interval(self, host: str) -> float:
+        average = self._response_times.get(host, 0.0)
+        return MIN_REQUEST_INTERVAL + (average if average > SLOW_RESPONSE_THRESHOLD else 0.0)
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        host = request.url.host
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+        # reserve the slot before sleeping, so concurrent callers queue up behind each other
+        start = max(now, self._next_start.get(host, now))
+        self._next_start[host] = start + self._interval(host)
+        await asyncio.sleep(start - now)
+        # a rate-limit response may have arrived while this request was waiting for its slot
+        while self._resume_at.get(host, 0.0) > loop.time():
+            await asyncio.sleep(self._resume_at[host] - loop.time())
+
+        sent = loop.time()
+        response = await self._transport.handle_async_request(request)
+        elapsed = loop.time() - sent
+        previous = self._response_times.get(host)
+        self._response_times[host] = elapsed if previous is None else (
+            RESPONSE_TIME_SMOOTHING * elapsed + (1 - RESPONSE_TIME_SMOOTHING) * previous
+        )
+
+        if response.status_code in RATE_LIMIT_STATUSES:
+            strikes = self._rate_limited.get(host, 0)
+            self._rate_limited[host] = strikes + 1
+            resume = loop.time() + retry_delay(response, strikes)
+            self._resume_at[host] = max(self._resume_at.get(host, 0.0), resume)
+        else:
+            self._rate_limited.pop(host, None)
+        return response
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+
+
+class CachingTransport(httpx.AsyncBaseTransport):
+    """
+    Transport wrapper that keeps successful product-page GETs in a local SQLite file, so re-running
+    the scraper within CACHE_EXPIRE_AFTER seconds doesn't download (or risk bot-checks on) the same pages.
+    Search pages are always fetched fresh since their results change between runs.
+    """
+
+    # hop-by-hop / encoding headers that no longer describe the stored (already decoded) body
+    _DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+    def __init__(self, transport: httpx.AsyncBaseTransport, path: str = CACHE_PATH,
+                 expire_after: int = CACHE_EXPIRE_AFTER):
+        self._transport = transport
+        self._expire_after = expire_after
+        self._db = sqlite3.connect(path)
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS responses (url TEXT PRIMARY KEY, fetched_at REAL, content_type TEXT, body BLOB)"
+        )
+        # purge expired entries on startup so the file doesn't grow without bound
+        self._db.execute("DELETE FROM responses WHERE fetched_at < ?", (time.time() - expire_after,))
+        self._db.commit()
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        if request.method != "GET" or not request.url.path.startswith("/ip/"):
+            return await self._transport.handle_async_request(request)
+
+        key = str(request.url)
+        row = self._db.execute(
+            "SELECT content_type, body FROM responses WHERE url = ? AND fetched_at >= ?",
+            (key, time.time() - self._expire_after),
+        ).fetchone()
+        if row is not None:
+            return httpx.Response(200, headers={"content-type": row[0]}, stream=httpx.ByteStream(row[1]),
+                                  request=request)
+
+        response = await self._transport.handle_async_request(request)
+        if response.status_code != 200:
+            return response
+        try:
+            body = await response.aread()
+        finally:
+            await response.aclose()
+
+        # a captcha page served with 200 must not be replayed from the cache for the next hour;
+        # is_bot_page only inspects the first 2000 characters, so decoding a prefix is enough
+        if not is_bot_page(body[:8192].decode(response.encoding or "utf-8", "ignore")):
+            self._db.execute(
+                "INSERT OR REPLACE INTO responses (url, fetched_at, content_type, body) VALUES (?, ?, ?, ?)",
+                (key, time.time(), response.headers.get("content-type", ""), body),
+            )
+            self._db.commit()
+        headers = [(k, v) for k, v in response.headers.multi_items() if k.lower() not in self._DROP_HEADERS]
+        # hand back an unread stream: httpx only sets Response.elapsed when it closes the stream itself
+        return httpx.Response(200, headers=headers, stream=httpx.ByteStream(body), request=request,
+                              extensions=response.extensions)
+
+    async def aclose(self) -> None:
+        await self._transport.aclose()
+        self._db.close()
+
+
+def make_client() -> httpx.AsyncClient:
+    """
+    Build an HTTP/2 client: concurrent requests to www.walmart.com are multiplexed over one
+    kept-alive TLS connection instead of paying a handshake per request.
+    Connection errors are retried by the transport; see get_with_retries for status retries.
+    Product pages are served from the on-disk cache when fresh (see CachingTransport); everything that
+    reaches the network is paced per host (see ThrottlingTransport).
+    """
+    transport = httpx.AsyncHTTPTransport(
+        http2=True,
+        retries=MAX_RETRIES,
+        limits=httpx.Limits(max_connections=20, max_keepalive_connections=20),
+    )
+    # follow redirects like requests did (canonical product slugs, bot-check redirects)
+    return httpx.AsyncClient(headers=HEADERS, timeout=15, follow_redirects=True,
+                             transport=CachingTransport(ThrottlingTransport(transport)))
+
+
+def retry_delay(resp: httpx.Response, attempt: int) -> float:
+    """
+    Seconds to wait before retrying resp: the server's Retry-After (delay-seconds or HTTP-date form)
+    if given, else exponential backoff.
+    """
+    retry_after = resp.headers.get("Retry-After", "").strip()
+    if retry_after.isdigit():
+        return float(retry_after)
+    try:
+        when = parsedate_to_datetime(retry_after)
+    except (TypeError, ValueError):
+        when = None
+    if when is not None:
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+    return 0.5 * 2 ** attempt
+
+
+async def get_with_retries(client: httpx.AsyncClient, url: str, **kwargs) -> httpx.Response:
+    """GET url, retrying rate-limit / server-error responses (honoring Retry-After)."""
+    for attempt in range(MAX_RETRIES + 1):
+        resp = await client.get(url, **kwargs)
+        if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+            break
+        await asyncio.sleep(retry_delay(resp, attempt))
+    resp.raise_for_status()
+    return resp
+
+
+@asynccontextmanager
+async def stream_with_retries(client: httpx.AsyncClient, url: str, **kwargs):
+    """Streaming counterpart of get_with_retries: yields an open response whose body has not been read yet."""
+    for attempt in range(MAX_RETRIES + 1):
+        async with client.stream("GET", url, **kwargs) as resp:
+            if resp.status_code not in RETRY_STATUSES or attempt == MAX_RETRIES:
+                resp.raise_for_status()
+                yield resp
+                break
+        await asyncio.sleep(retry_delay(resp, attempt))
 
 
 def is_bot_page(html_text: str) -> bool:
-    text = html_text[:2000].lower()
-    return any(kw.lower() in text for kw in BOT_CHECK_KEYWORDS)
+    head = html_text[:2000]
+    if _BOT_DB is not None:
+        try:
+            # a truthy handler result stops the scan (HS_SCAN_TERMINATED) at the first keyword hit
+            _BOT_DB.scan(head.encode("utf-8", "ignore"), match_event_handler=lambda *_: True)
+        except hyperscan.ScanTerminated:
+            return True
+        return False
+    return _BOT_RE.search(head.lower()) is not None
 
 
+@functools.lru_cache(maxsize=4096)
 def normalize_product_url(raw: str) -> str:
     """Normalize product URL by removing query and fragment and ensuring full domain."""
+    # fast path: the common bare '/ip/...' path needs no splitting
+    if raw.startswith("/ip/") and "?" not in raw and "#" not in raw:
+        return "https://www.walmart.com" + raw
     parsed = urlsplit(raw)
     scheme = parsed.scheme or "https"
     netloc = parsed.netloc or "www.walmart.com"
@@ -51,70 +305,167 @@ def get_search_url(query: str, page: int) -> str:
     return f"https://www.walmart.com/search?query={quote_plus(query)}&page={page}"
 
 
-def get_link(query: str, page_number: int, session: requests.Session) -> list:
+def extract_product_hrefs(html: str) -> list:
     """
-    Return deduped product URLs from a Walmart search page.
-    Strategy:
-      1) Try to collect anchors (<a href="...">) containing '/ip/'.
-      2) If none found, run a regex over the page text to extract '/ip/...' paths embedded in scripts/JSON.
+    Return the raw href of every anchor that points at a '/ip/' product page, excluding '/b/' browse links.
+    Both filters are part of the selector, so non-product anchors are rejected inside the C parser.
     """
-    url = get_search_url(query, page_number)
-    resp = session.get(url, headers=HEADERS, timeout=15)
-    resp.raise_for_status()
-    html = resp.text
+    if HTMLParser is not None:
+        selector = "a[href*='/ip/']:not([href^='/b/']):not([href^='/B/'])"
+        return [node.attributes.get("href") or "" for node in HTMLParser(html).css(selector)]
+    # XPath traversal runs in C and returns plain strings - no element objects per anchor
+    xpath = '//a[contains(@href, "/ip/") and not(starts-with(translate(@href, "B", "b"), "/b/"))]/@href'
+    return lxml.html.fromstring(html).xpath(xpath, smart_strings=False)
 
-    if is_bot_page(html):
-        raise RuntimeError("Request looks like a bot-check/captcha page. Try different IP / headers / manual verification.")
 
-    soup = BeautifulSoup(html, "html.parser")
+def extract_json_scripts(html: str) -> tuple:
+    """
+    Return (next_data_text, ld_json_texts) for a product page:
+    the text of the __NEXT_DATA__ script (or None) and the texts of all application/ld+json scripts.
+    """
+    if HTMLParser is not None:
+        tree = HTMLParser(html)
+        node = tree.css_first("script#__NEXT_DATA__")
+        next_data = node.text() if node is not None else None
+        ld_json = [s.text() for s in tree.css('script[type="application/ld+json"]')]
+        return next_data, ld_json
+
+    tree = lxml.html.fromstring(html)
+    next_data = tree.xpath('//script[@id="__NEXT_DATA__"]/text()', smart_strings=False)
+    ld_json = tree.xpath('//script[@type="application/ld+json"]/text()', smart_strings=False)
+    return (next_data[0] if next_data else None), ld_json
 
-    product_urls = []
 
-    # 1) anchor-based extraction (preferred)
-    for a in soup.find_all("a", href=True):
-        href = a.get("href", "")
-        if "/ip/" in href and not href.lower().startswith("/b/"):
+async def get_link(query: str, page_number: int, client: httpx.AsyncClient, limit: int = None,
+                   seen: dict = None) -> list:
+    """
+    Return deduped product URLs from a Walmart search page.
+    Strategy:
+      1) Stream the page and run the precompiled regex over each decoded chunk to extract '/ip/...' paths
+         (covers both anchors and paths embedded in scripts/JSON). Once `limit` URLs not already in
+         `seen` (e.g. collected from earlier, overlapping result pages) are found the rest of the
+         download is abandoned.
+      2) If none found, parse the DOM and collect anchors (<a href="...">) containing '/ip/'.
+    """
+    url = get_search_url(query, page_number)
+    product_urls = {}  # insertion-ordered set
+    parts = []  # page text, only kept until a product path is seen (needed for the DOM fallback)
+    tail = ""
+
+    async with stream_with_retries(client, url) as resp:
+        async for chunk in resp.aiter_text(STREAM_CHUNK_SIZE):
+            # the bot-check markers sit at the top of the page, so only the first chunk is inspected
+            if not tail and is_bot_page(chunk):
+                raise RuntimeError("Request looks like a bot-check/captcha page. Try different IP / headers / manual verification.")
+
+            # 1) regex search for '/ip/...' occurrences in the raw HTML (no DOM construction on the hot path)
+            window = tail + chunk
+            for m in _IP_RE.finditer(window):
+                # a match running up to the end of the window may continue in the next chunk; it is re-scanned there
+                if m.end() < len(window):
+                    product_urls[normalize_product_url(m.group(1))] = None
+            tail = window[-STREAM_OVERLAP:]
+
+            if product_urls:
+                parts = None  # the DOM fallback won't be needed
+            else:
+                parts.append(chunk)
+            if limit and len(product_urls.keys() - (seen or {})) >= limit:
+                break
+        else:
+            # the body is complete, so a path ending on the very last character is whole
+            for p in _IP_RE.findall(tail):
+                product_urls[normalize_product_url(p)] = None
+
+    # 2) fallback: anchor-based extraction from the parsed DOM
+    if not product_urls and parts:
+        for href in extract_product_hrefs("".join(parts)):
             # prefer normalized canonical path without query-string
-            # if href lacks scheme/netloc, prepend walmart domain
+            # (a relative href gets the walmart scheme/domain filled in)
             try:
-                canonical = normalize_product_url(href if href.startswith("http") else "https://www.walmart.com" + href)
+                canonical = normalize_product_url(href)
             except Exception:
                 canonical = "https://www.walmart.com" + href.split("?")[0].split("#")[0]
-            product_urls.append(canonical)
-
-    # 2) fallback: regex search for '/ip/...' occurrences in the raw HTML (covers JS-inserted content)
-    if not product_urls:
-        raw_matches = re.findall(r'(?:(?:https?:)?//[^/]+)?(/ip/[^"\'\\\s<>]+)', html)
-        for p in raw_matches:
-            # remove query and fragment
-            p = p.split('?')[0].split('#')[0]
-            if not p.startswith("/ip/"):
-                continue
-            full = "https://www.walmart.com" + p
-            product_urls.append(full)
+            product_urls[canonical] = None
 
-    # dedupe preserving order
-    seen = set()
-    deduped = []
-    for u in product_urls:
-        if u not in seen:
-            seen.add(u)
-            deduped.append(u)
+    return list(product_urls)
 
-    return deduped
 
+def _lazy_next_data_product(raw: bytes):
+    """
+    Single ijson pass over __NEXT_DATA__ that builds only the product / first products item / reviews
+    subtrees. Returns (product, reviews), or None if they aren't all found within LAZY_EVENT_BUDGET
+    events - at that point a full decode is cheaper than scanning on.
+    """
+    targets = {
+        NEXT_DATA_PREFIX + ".product": "product",
+        NEXT_DATA_PREFIX + ".products.item": "products",
+        NEXT_DATA_PREFIX + ".reviews": "reviews",
+    }
+    found = {}
+    events = ijson.parse(io.BytesIO(raw), use_float=True)
+    for count, (path, event, value) in enumerate(events):
+        if count >= LAZY_EVENT_BUDGET:
+            return None
+        if path == NEXT_DATA_PREFIX and event == "end_map":
+            break  # the whole data object has been seen
+        name = targets.get(path)
+        if name is None or name in found:
+            continue
+        if event in ("start_map", "start_array"):
+            # same subtree assembly as ijson.items, driven off the shared event stream
+            builder = ijson.ObjectBuilder()
+            depth = 0
+            while True:
+                if event in ("start_map", "start_array"):
+                    depth += 1
+                elif event in ("end_map", "end_array"):
+                    depth -= 1
+                if depth == 0:
+                    break
+                builder.event(event, value)
+                path, event, value = next(events)
+            found[name] = builder.value
+        else:
+            found[name] = value
+        if found.get("product") and "reviews" in found:
+            break
+    else:
+        return None  # no initialData.data object at all; let the full decode report it
 
-def parse_next_data(script_text: str) -> dict:
+    product = found.get("product") or found.get("products")
+    return product, found.get("reviews") or {}
+
+
+def load_next_data_product(script_text: str) -> tuple:
     """
-    Parse the Next.js __NEXT_DATA__ script block and try to extract product info.
-    Returns a dict of fields or raises if structure not as expected.
+    Return (product, reviews) from the Next.js __NEXT_DATA__ JSON.
+    With ijson's C backend a bounded single pass materializes only those subtrees, which wins when
+    they come early in the (often multi-MB) blob; otherwise the whole document is decoded.
     """
-    data = json.loads(script_text)
+    if _IJSON_FAST:
+        try:
+            lazy = _lazy_next_data_product(script_text.encode("utf-8"))
+        except ijson.JSONError:
+            lazy = None
+        if lazy is not None:
+            return lazy
+
+    data = _json_loads(script_text)
     initial_data = data.get("props", {}).get("pageProps", {}).get("initialData", {}).get("data", {})
     product = initial_data.get("product") or (
         initial_data.get("products")[0] if isinstance(initial_data.get("products"), list) else None
     )
     reviews = initial_data.get("reviews", {}) or {}
+    return product, reviews
+
+
+def parse_next_data(script_text: str) -> dict:
+    """
+    Parse the Next.js __NEXT_DATA__ script block and try to extract product info.
+    Returns a dict of fields or raises if structure not as expected.
+    """
+    product, reviews = load_next_data_product(script_text)
 
     if not product:
         raise KeyError("No 'product' key in __NEXT_DATA__ initialData")
@@ -150,7 +501,7 @@ def parse_next_data(script_text: str) -> dict:
     }
 
 
-def prod_info(product_url: str, session: requests.Session) -> dict:
+async def prod_info(product_url: str, client: httpx.AsyncClient) -> dict:
     """
     Fetch a product page and extract product information using several fallbacks:
       1) __NEXT_DATA__ (Next.js page JSON)
@@ -158,34 +509,29 @@ def prod_info(product_url: str, session: requests.Session) -> dict:
       3) heuristic search for product JSON in page text
     Returns a dict with product fields or raises an Exception with a helpful message.
     """
-    resp = session.get(product_url, headers=HEADERS, timeout=15)
-    resp.raise_for_status()
+    resp = await get_with_retries(client, product_url)
     html = resp.text
 
     if is_bot_page(html):
         raise RuntimeError("Product page looks like a bot-check/captcha. Manual verification required or try different IP/headers.")
 
-    soup = BeautifulSoup(html, "html.parser")
+    script_text, ld_json_texts = extract_json_scripts(html)
 
     # 1) try __NEXT_DATA__
-    script_next = soup.find("script", id="__NEXT_DATA__")
-    if script_next:
-        script_text = script_next.string or script_next.get_text()
-        if script_text:
-            try:
-                return parse_next_data(script_text)
-            except Exception:
-                # fall back to other parsing methods
-                pass
+    if script_text:
+        try:
+            return parse_next_data(script_text)
+        except Exception:
+            # fall back to other parsing methods
+            pass
 
     # 2) try application/ld+json (schema.org)
-    for s in soup.find_all("script", type="application/ld+json"):
+    for jtext in ld_json_texts:
         # some pages have empty or malformed scripts; skip those safely
-        jtext = s.string or s.get_text()
         if not jtext:
             continue
         try:
-            jd = json.loads(jtext)
+            jd = _json_loads(jtext)
         except Exception:
             # sometimes there are multiple JSON objects concatenated or comments - skip
             continue
@@ -229,14 +575,9 @@ def prod_info(product_url: str, session: requests.Session) -> dict:
         # look for a JSON-looking block around "props" or "initialData"
         idx = html.find('{"props"')
         if idx != -1:
-            # take a reasonable slice and attempt to fix/truncate to JSON
-            snippet = html[idx: idx + 500000]  # large enough to include the JSON block
-            # cut off at first closing </script> if present
-            end_idx = snippet.find("</script>")
-            if end_idx != -1:
-                snippet = snippet[:end_idx]
             try:
-                cand = json.loads(snippet)
+                # decode exactly the JSON value starting at idx, in place - no slicing of the page
+                cand, _end = _RAW_DECODER.raw_decode(html, idx)
                 initial_data = cand.get("props", {}).get("pageProps", {}).get("initialData", {}).get("data", {})
                 product = initial_data.get("product")
                 if product:
@@ -260,8 +601,62 @@ def prod_info(product_url: str, session: requests.Session) -> dict:
     raise RuntimeError(f"Could not locate structured product JSON on the page. Page sample: {sample}")
 
 
-def main():
-    session = requests.Session()
+async def fetch_product(product_url: str, client: httpx.AsyncClient, semaphore: asyncio.Semaphore) -> dict:
+    """Scrape one product page while holding a semaphore slot (requests are paced by ThrottlingTransport)."""
+    async with semaphore:
+        print(f"Fetching: {product_url}")
+        info = await prod_info(product_url, client)
+    info["url"] = product_url
+    return info
+
+
+async def collect_product_urls(query: str, max_results: int, max_pages: int, client: httpx.AsyncClient) -> list:
+    """Walk search result pages in order until max_results product URLs are collected."""
+    collected = {}  # insertion-ordered set of product URLs
+
+    for page in range(1, max_pages + 1):
+        try:
+            urls = await get_link(query, page, client, limit=max_results - len(collected), seen=collected)
+        except Exception as e:
+            print(f"Failed to fetch/parse search page {page}: {e}")
+            break
+
+        for u in urls:
+            if u not in collected:
+                collected[u] = None
+                if len(collected) >= max_results:
+                    break
+        if len(collected) >= max_results:
+            break
+
+    return list(collected)
+
+
+async def scrape_products(product_urls: list, client: httpx.AsyncClient) -> list:
+    """Fetch product pages concurrently (bounded by MAX_CONCURRENT_PRODUCTS); results keep search order."""
+    semaphore = asyncio.Semaphore(MAX_CONCURRENT_PRODUCTS)
+    outcomes = await asyncio.gather(
+        *(fetch_product(u, client, semaphore) for u in product_urls),
+        return_exceptions=True,
+    )
+
+    results = []
+    for url, outcome in zip(product_urls, outcomes):
+        if isinstance(outcome, Exception):
+            print(f"  -> Failed to parse product page {url}: {outcome}")
+        else:
+            results.append(outcome)
+    return results
+
+
+def dump_results(results: list) -> bytes:
+    """Serialize results as 2-space indented UTF-8 JSON (non-ASCII kept as-is), using orjson when available."""
+    if orjson is not None:
+        return orjson.dumps(results, option=orjson.OPT_INDENT_2)
+    return json.dumps(results, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+async def main():
     # optional: rotate a list of user-agents in HEADERS if needed (kept simple here)
     query = input("Enter the product to search: ").strip()
     if not query:
@@ -277,57 +672,32 @@ def main():
     except Exception:
         max_pages = 6
 
-    collected_urls = []
-    collected_set = set()
     print(f"Searching Walmart for: '{query}' (up to {max_results} products, scanning up to {max_pages} pages)")
 
-    for page in range(1, max_pages + 1):
-        try:
-            urls = get_link(query, page, session)
-        except Exception as e:
-            print(f"Failed to fetch/parse search page {page}: {e}")
-            break
-
-        for u in urls:
-            if u not in collected_set:
-                collected_set.add(u)
-                collected_urls.append(u)
-                if len(collected_urls) >= max_results:
-                    break
-        if len(collected_urls) >= max_results:
-            break
+    async with make_client() as client:
+        collected_urls = await collect_product_urls(query, max_results, max_pages, client)
+        if not collected_urls:
+            print("No product URLs found. Try a different query, increase max_pages, or run from a different IP (bot-checks possible).")
+            return
 
-        # polite delay between search pages
-        time.sleep(random.uniform(0.9, 1.6))
-
-    if not collected_urls:
-        print("No product URLs found. Try a different query, increase max_pages, or run from a different IP (bot-checks possible).")
-        return
-
-    results = []
-    for i, url in enumerate(collected_urls[:max_results], start=1):
-        print(f"[{i}/{min(max_results, len(collected_urls))}] Fetching: {url}")
-        try:
-            info = prod_info(url, session)
-            info["url"] = url
-            results.append(info)
-        except Exception as e:
-            print(f"  -> Failed to parse product page: {e}")
-        # courteous delay between product requests
-        time.sleep(random.uniform(0.9, 1.6))
+        targets = collected_urls[:max_results]
+        print(f"Fetching {len(targets)} product pages...")
+        results = await scrape_products(targets, client)
 
+    # serialize once; the same UTF-8 bytes are printed and written to disk
+    payload = dump_results(results)
     print("\nResults:")
-    print(json.dumps(results, indent=2, ensure_ascii=False))
+    print(payload.decode("utf-8"))
 
     # save results
     fname = "walmart_results.json"
     try:
-        with open(fname, "w", encoding="utf-8") as f:
-            json.dump(results, f, indent=2, ensure_ascii=False)
+        with open(fname, "wb") as f:
+            f.write(payload)
         print(f"\nSaved results to {fname}")
     except Exception as e:
         print(f"Could not save results: {e}")
 
 
 if __name__ == "__main__":
-    main()
+    asyncio.run(main())
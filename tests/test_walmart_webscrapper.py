@@ -0,0 +1,258 @@
+import asyncio
+import os
+import sys
+from datetime import datetime, timedelta, timezone
+from email.utils import format_datetime
+
+import httpx
+import pytest
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import Walmart_webscrapper as scraper  # noqa: E402
+
+PRODUCT_URL = "https://www.walmart.com/ip/Widget/123"
+PRODUCT_PAGE = (
+    '<html><head><script id="__NEXT_DATA__" type="application/json">'
+    '{"props": {"pageProps": {"initialData": {"data": {'
+    '"product": {"name": "Widget", "priceInfo": {"currentPrice": {"price": 9.99}}, "modelNumber": "W-1"},'
+    '"reviews": {"customerRating": 4.5, "totalReviewCount": 10}}}}}}'
+    '</script></head><body></body></html>'
+)
+
+
+class StreamedBody(httpx.AsyncByteStream):
+    """An unread response body, delivered in pieces the way httpcore streams it."""
+
+    def __init__(self, body: bytes, piece_size: int = 64 * 1024):
+        self._body = body
+        self._piece_size = piece_size
+        self.sent = 0  # bytes handed to the reader so far
+
+    async def __aiter__(self):
+        while self.sent < len(self._body):
+            piece = self._body[self.sent:self.sent + self._piece_size]
+            self.sent += len(piece)
+            yield piece
+
+
+class FakeWalmart(httpx.AsyncBaseTransport):
+    """Stands in for httpx.AsyncHTTPTransport underneath make_client()'s transport stack."""
+
+    def __init__(self):
+        self.pages = {}  # path (plus query, if any) -> page text
+        self.statuses = {}  # path -> status codes to answer with (in order) before serving the page
+        self.piece_size = 64 * 1024
+        self.bodies = []
+        self.requests = []
+        self.started = []  # event-loop time at which each request reached the "network"
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        self.requests.append(str(request.url))
+        self.started.append(asyncio.get_running_loop().time())
+        pending = self.statuses.get(request.url.path)
+        if pending:
+            return httpx.Response(pending.pop(0), stream=StreamedBody(b""))
+        body = StreamedBody(self.pages[request.url.raw_path.decode()].encode("utf-8"), self.piece_size)
+        self.bodies.append(body)
+        return httpx.Response(200, headers={"content-type": "text/html; charset=utf-8"}, stream=body)
+
+
+@pytest.fixture
+def walmart(monkeypatch, tmp_path):
+    monkeypatch.chdir(tmp_path)  # CachingTransport keeps walmart_cache.sqlite in the working directory
+    monkeypatch.setattr(scraper, "MIN_REQUEST_INTERVAL", 0)
+    fake = FakeWalmart()
+    monkeypatch.setattr(scraper.httpx, "AsyncHTTPTransport", lambda **kwargs: fake)
+    return fake
+
+
+def scrape_runs(url: str, runs: int) -> list:
+    """Call prod_info once per run, each with a fresh client like separate invocations of the script."""
+    async def scrape():
+        outcomes = []
+        for _ in range(runs):
+            async with scraper.make_client() as client:
+                try:
+                    outcomes.append(await scraper.prod_info(url, client))
+                except Exception as e:
+                    outcomes.append(e)
+        return outcomes
+    return asyncio.run(scrape())
+
+
+def test_prod_info_on_cache_miss_and_hit(walmart):
+    walmart.pages["/ip/Widget/123"] = PRODUCT_PAGE
+
+    first, second = scrape_runs(PRODUCT_URL, 2)
+
+    assert first["name"] == second["name"] == "Widget"
+    assert first["price"] == 9.99
+    assert walmart.requests == [PRODUCT_URL]
+
+
+def test_bot_check_page_is_not_cached(walmart):
+    walmart.pages["/ip/Widget/123"] = "<html><title>Robot or human? Please verify</title></html>"
+
+    outcomes = scrape_runs(PRODUCT_URL, 2)
+
+    assert all(isinstance(e, RuntimeError) and "bot-check" in str(e) for e in outcomes)
+    assert walmart.requests == [PRODUCT_URL, PRODUCT_URL]
+
+
+def test_requests_are_spaced_per_host_across_workers(walmart, monkeypatch):
+    monkeypatch.setattr(scraper, "MIN_REQUEST_INTERVAL", 0.05)
+    urls = [f"https://www.walmart.com/ip/Widget/{i}" for i in range(4)]
+    for url in urls:
+        walmart.pages[httpx.URL(url).path] = PRODUCT_PAGE
+
+    async def scrape():
+        async with scraper.make_client() as client:
+            return await scraper.scrape_products(urls, client)
+
+    results = asyncio.run(scrape())
+
+    assert [r["url"] for r in results] == urls
+    gaps = [b - a for a, b in zip(walmart.started, walmart.started[1:])]
+    assert len(gaps) == 3 and min(gaps) >= 0.045
+
+
+@pytest.mark.skipif(not scraper._IJSON_FAST, reason="lazy __NEXT_DATA__ parsing needs ijson's yajl2_c backend")
+@pytest.mark.parametrize("data", [
+    {"product": {"name": "Widget"}, "reviews": {"customerRating": 4.5}, "bulk": list(range(5000))},
+    {"bulk": list(range(5000)), "product": {"name": "Widget"}, "reviews": {"customerRating": 4.5}},
+    {"product": None, "products": [{"name": "Widget"}, {"name": "Other"}]},
+    {"reviews": {"customerRating": 4.5}},
+])
+def test_lazy_next_data_matches_full_decode(data, monkeypatch):
+    script_text = scraper.json.dumps({"props": {"pageProps": {"initialData": {"data": data}}}})
+
+    lazy = scraper.load_next_data_product(script_text)
+    monkeypatch.setattr(scraper, "_IJSON_FAST", False)
+
+    assert lazy == scraper.load_next_data_product(script_text)
+
+
+def search_page(product_ids) -> str:
+    """A search results page linking to /ip/Widget-<id>/<id> with tracking query strings."""
+    anchors = "".join(f'<a href="/ip/Widget-{i}/{1000 + i}?from=search">Widget {i}</a>\n' for i in product_ids)
+    return f"<html><body>{anchors}</body></html>"
+
+
+def widget_urls(product_ids) -> list:
+    return [f"https://www.walmart.com/ip/Widget-{i}/{1000 + i}" for i in product_ids]
+
+
+@pytest.fixture
+def small_chunks(monkeypatch, walmart):
+    # a few anchors per chunk, so product paths regularly straddle chunk boundaries
+    monkeypatch.setattr(scraper, "STREAM_CHUNK_SIZE", 50)
+    monkeypatch.setattr(scraper, "STREAM_OVERLAP", 64)
+    walmart.piece_size = 50
+    return walmart
+
+
+def run_get_link(page_number: int, **kwargs) -> list:
+    async def scrape():
+        async with scraper.make_client() as client:
+            return await scraper.get_link("widget", page_number, client, **kwargs)
+    return asyncio.run(scrape())
+
+
+def test_get_link_matches_paths_split_across_chunks(small_chunks):
+    small_chunks.pages["/search?query=widget&page=1"] = search_page(range(30))
+
+    assert run_get_link(1) == widget_urls(range(30))
+    assert small_chunks.bodies[0].sent == len(search_page(range(30)))
+
+
+def test_get_link_stops_reading_once_limit_reached(small_chunks):
+    small_chunks.pages["/search?query=widget&page=1"] = search_page(range(30))
+
+    urls = run_get_link(1, limit=5)
+
+    assert urls[:5] == widget_urls(range(5)) and len(urls) < 30
+    assert small_chunks.bodies[0].sent < len(search_page(range(30)))
+
+
+def test_get_link_limit_ignores_already_seen_urls(small_chunks):
+    small_chunks.pages["/search?query=widget&page=1"] = search_page(range(30))
+    seen = dict.fromkeys(widget_urls(range(10)))
+
+    urls = run_get_link(1, limit=5, seen=seen)
+
+    assert [u for u in urls if u not in seen][:5] == widget_urls(range(10, 15))
+
+
+def test_collect_product_urls_across_overlapping_pages(small_chunks):
+    small_chunks.pages["/search?query=widget&page=1"] = search_page(range(10))
+    small_chunks.pages["/search?query=widget&page=2"] = search_page(range(8, 20))
+
+    async def collect():
+        async with scraper.make_client() as client:
+            return await scraper.collect_product_urls("widget", 12, 2, client)
+
+    assert asyncio.run(collect()) == widget_urls(range(12))
+
+
+def test_accept_encoding_only_offers_decodable_encodings(walmart):
+    try:
+        import brotli  # noqa: F401
+        has_brotli = True
+    except ImportError:
+        has_brotli = False
+
+    client = scraper.make_client()
+    accept_encoding = client.headers["accept-encoding"]
+    asyncio.run(client.aclose())
+
+    assert "gzip" in accept_encoding
+    assert ("br" in accept_encoding) == has_brotli
+
+
+@pytest.mark.parametrize("retry_after, low, high", [
+    ("7", 7, 7),
+    (format_datetime(datetime.now(timezone.utc) + timedelta(seconds=30), usegmt=True), 25, 30),
+    (format_datetime(datetime.now(timezone.utc) - timedelta(seconds=30), usegmt=True), 0, 0),
+    ("", 2, 2),  # no header: exponential backoff for attempt 2
+])
+def test_retry_delay_honors_both_retry_after_forms(retry_after, low, high):
+    resp = httpx.Response(429, headers={"Retry-After": retry_after} if retry_after else {})
+
+    assert low <= scraper.retry_delay(resp, 2) <= high
+
+
+def test_rate_limit_holds_back_every_worker(walmart, monkeypatch):
+    monkeypatch.setattr(scraper, "MIN_REQUEST_INTERVAL", 0.02)
+    monkeypatch.setattr(scraper, "retry_delay", lambda resp, attempt: 0.2)
+    urls = [f"https://www.walmart.com/ip/Widget/{i}" for i in range(3)]
+    for url in urls:
+        walmart.pages[httpx.URL(url).path] = PRODUCT_PAGE
+    walmart.statuses["/ip/Widget/0"] = [429]
+
+    async def scrape():
+        async with scraper.make_client() as client:
+            return await scraper.scrape_products(urls, client)
+
+    results = asyncio.run(scrape())
+
+    assert [r["url"] for r in results] == urls
+    assert walmart.requests[0] == urls[0]
+    rate_limited_at = walmart.started[0]
+    assert all(t - rate_limited_at >= 0.19 for t in walmart.started[1:])
+
+
+@pytest.mark.skipif(scraper.hyperscan is None, reason="hyperscan is not installed")
+@pytest.mark.parametrize("html", [
+    "<html><body>Widgets and gadgets</body></html>",
+    "<title>Robot or human?</title>",
+    "<h1>ACCESS DENIED</h1>",
+    "Please Verify you are a human",
+    "x" * 1995 + "captcha",  # keyword straddles the 2000-character window
+    "x" * 2000 + "captcha",  # keyword outside the window
+    "Café – unusual traffic",
+    "",
+])
+def test_hyperscan_bot_check_agrees_with_regex(html):
+    assert scraper._BOT_DB is not None
+    assert scraper.is_bot_page(html) == (scraper._BOT_RE.search(html[:2000].lower()) is not None)